@@ -1,62 +1,56 @@
 """ Dictionary holding defaults for cube_build
 """
+from collections import defaultdict
+
 from .. import datamodels
 import logging
 log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 
+_IFUImageModel = datamodels.IFUImageModel
 
-class FileTable():
-    """ Dictionary contains defaults for MIRI and NIRSPEC data
-    """
-    def __init__(self):
-
-        self.FileMap = {}
-        self.FileMap['MIRI'] = {}
-
-        self.FileMap['MIRI']['1'] = {}
-        self.FileMap['MIRI']['1']['short'] = []
-        self.FileMap['MIRI']['1']['medium'] = []
-        self.FileMap['MIRI']['1']['long'] = []
 
-        self.FileMap['MIRI']['2'] = {}
-        self.FileMap['MIRI']['2']['short'] = []
-        self.FileMap['MIRI']['2']['medium'] = []
-        self.FileMap['MIRI']['2']['long'] = []
-
-        self.FileMap['MIRI']['3'] = {}
-        self.FileMap['MIRI']['3']['short'] = []
-        self.FileMap['MIRI']['3']['medium'] = []
-        self.FileMap['MIRI']['3']['long'] = []
-
-        self.FileMap['MIRI']['4'] = {}
-        self.FileMap['MIRI']['4']['short'] = []
-        self.FileMap['MIRI']['4']['medium'] = []
-        self.FileMap['MIRI']['4']['long'] = []
+def _band_map():
+    """ Map of subchannel (MIRI) or filter (NIRSPEC) to a list of models
+    """
+    return defaultdict(list)
 
-        self.FileMap['NIRSPEC'] = {}
-        self.FileMap['NIRSPEC']['prism'] = {}
-        self.FileMap['NIRSPEC']['prism']['clear'] = []
 
-        self.FileMap['NIRSPEC']['g140m'] = {}
-        self.FileMap['NIRSPEC']['g140m']['f070lp'] = []
-        self.FileMap['NIRSPEC']['g140m']['f100lp'] = []
+def _instrument_map():
+    """ Map of channel (MIRI) or grating (NIRSPEC) to a band map
+    """
+    return defaultdict(_band_map)
 
-        self.FileMap['NIRSPEC']['g140h'] = {}
-        self.FileMap['NIRSPEC']['g140h']['f070lp'] = []
-        self.FileMap['NIRSPEC']['g140h']['f100lp'] = []
 
-        self.FileMap['NIRSPEC']['g235m'] = {}
-        self.FileMap['NIRSPEC']['g235m']['f170lp'] = []
+def _lower(value):
+    """ Lower case value, without making a new string if it already is
+    """
+    return value if value.islower() else value.lower()
 
-        self.FileMap['NIRSPEC']['g235h'] = {}
-        self.FileMap['NIRSPEC']['g235h']['f170lp'] = []
 
-        self.FileMap['NIRSPEC']['g395m'] = {}
-        self.FileMap['NIRSPEC']['g395m']['f290lp'] = []
+class FileTable():
+    """ Dictionary contains defaults for MIRI and NIRSPEC data
+    """
+    def __init__(self):
 
-        self.FileMap['NIRSPEC']['g395h'] = {}
-        self.FileMap['NIRSPEC']['g395h']['f290lp'] = []
+        # flat map of (instrument, channel or grating, subchannel or filter)
+        # to the list of models covering that band
+        self._buckets = {}
+        self._filemap = None
+
+    @property
+    def FileMap(self):
+        """ FileMap[instrument][channel or grating][subchannel or filter]
+        holds the list of models for each band. The nested map is built from
+        the flat band lists on first access and the band lists are created
+        on first use rather than pre-populated for every band.
+        """
+        if self._filemap is None:
+            filemap = defaultdict(_instrument_map)
+            for (instrument, par1, par2), models in self._buckets.items():
+                filemap[instrument][par1][par2] = models
+            self._filemap = filemap
+        return self._filemap
 # ********************************************************************************
 
     def set_file_table(self,
@@ -80,6 +74,12 @@ class FileTable():
         """
         num = 0
         num = len(input_filenames)
+        if num == 0:
+            raise ErrorNoInputModels("No input models for the cube")
+        # the bands of each model are collected first, and only added to
+        # the table once all the models have been checked
+        new_entries = []
+        first_instrument = None
 # ________________________________________________________________________________
 # Loop over input list of files and assign fill in the MasterTable with filename
 # for the correct (channel-subchannel) or (grating-subchannel)
@@ -89,35 +89,72 @@ class FileTable():
             input = input_models[i]
 
         # Open the input data model & Fill in the FileMap information
-
-            with datamodels.IFUImageModel(input) as input_model:
-
-                instrument = input_model.meta.instrument.name.upper()
-                assign_wcs = input_model.meta.cal_step.assign_wcs
-
-                if(assign_wcs != 'COMPLETE'):
-                    raise ErrorNoAssignWCS("Assign WCS has not been run on file %s",
-                                           ifile)
-            # _____________________________________________________________________
-            # MIRI instrument
-                if instrument == 'MIRI':
-                    channel = input_model.meta.instrument.channel
-                    subchannel = input_model.meta.instrument.band.lower()
-                    clenf = len(channel)
-                    for k in range(clenf):
-                        self.FileMap['MIRI'][channel[k]][subchannel].append(input_model)
-            # _____________________________________________________________________
-            # NIRSPEC instrument
-                elif instrument == 'NIRSPEC':
-                    fwa = input_model.meta.instrument.filter.lower()
-                    gwa = input_model.meta.instrument.grating.lower()
-
-                    self.FileMap['NIRSPEC'][gwa][fwa].append(input_model)
+        # Models that already are IFUImageModels are used as is, anything
+        # else is opened (or converted and validated) as an IFUImageModel
+
+            if type(input) is _IFUImageModel:
+                input_model = input
+            else:
+                input_model = _IFUImageModel(input)
+
+            meta = input_model.meta
+            instrument_meta = meta.instrument
+            instrument = instrument_meta.name.upper()
+            if first_instrument is None:
+                first_instrument = instrument
+            elif instrument != first_instrument:
+                raise ErrorMixedInstruments(
+                    "Input models must come from a single instrument, "
+                    "found %s and %s" % (first_instrument, instrument))
+            assign_wcs = meta.cal_step.assign_wcs
+
+            if(assign_wcs != 'COMPLETE'):
+                raise ErrorNoAssignWCS("Assign WCS has not been run on file %s"
+                                       % ifile)
+        # _____________________________________________________________________
+        # MIRI instrument
+            if instrument == 'MIRI':
+                channel = instrument_meta.channel
+                subchannel = _lower(instrument_meta.band)
+                if len(channel) == 1:
+                    new_entries.append((('MIRI', channel, subchannel),
+                                        input_model))
                 else:
-                    pass
-#                    log.info('Instrument not valid for cube')
-        return instrument
+                    for this_channel in channel:
+                        key = ('MIRI', this_channel, subchannel)
+                        new_entries.append((key, input_model))
+        # _____________________________________________________________________
+        # NIRSPEC instrument
+            elif instrument == 'NIRSPEC':
+                fwa = _lower(instrument_meta.filter)
+                gwa = _lower(instrument_meta.grating)
+
+                key = ('NIRSPEC', gwa, fwa)
+                new_entries.append((key, input_model))
+            else:
+                pass
+#                log.info('Instrument not valid for cube')
+        buckets = self._buckets
+        for key, input_model in new_entries:
+            buckets.setdefault(key, []).append(input_model)
+        # new bands may have been added, rebuild FileMap on next access
+        self._filemap = None
+        return first_instrument
 
 
 class ErrorNoAssignWCS(Exception):
+    """ Exception for an input file that assign_wcs has not been run on
+    """
+    pass
+
+
+class ErrorNoInputModels(Exception):
+    """ Exception for an empty list of input files
+    """
+    pass
+
+
+class ErrorMixedInstruments(Exception):
+    """ Exception for input files that are not all from one instrument
+    """
     pass
@@ -506,3 +506,34 @@ def test_calspec3_config_nirspec_multi(_jail, nirspec_medium_coverage):
 
     assert cube_pars['1']['par1'] == ['g140m', 'g235m']
     assert cube_pars['1']['par2'] == ['f100lp', 'f170lp']
+
+
+def test_file_table_instrument(miri_full_coverage, nirspec_medium_coverage):
+    """ Test the instrument name returned for single instrument input"""
+
+    master_table = file_table.FileTable()
+    this_instrument = master_table.set_file_table(
+        miri_full_coverage, ['test.fits'] * len(miri_full_coverage))
+    assert this_instrument == 'MIRI'
+
+    master_table = file_table.FileTable()
+    this_instrument = master_table.set_file_table(
+        nirspec_medium_coverage, ['test.fits'] * len(nirspec_medium_coverage))
+    assert this_instrument == 'NIRSPEC'
+
+
+def test_file_table_mixed_instruments(miri_full_coverage,
+                                      nirspec_medium_coverage):
+    """ Test that mixed instrument or empty input is rejected"""
+
+    input_models = miri_full_coverage + nirspec_medium_coverage
+    master_table = file_table.FileTable()
+    with pytest.raises(file_table.ErrorMixedInstruments):
+        master_table.set_file_table(input_models,
+                                    ['test.fits'] * len(input_models))
+    # a rejected input list leaves the table empty
+    assert master_table.FileMap == {}
+
+    master_table = file_table.FileTable()
+    with pytest.raises(file_table.ErrorNoInputModels):
+        master_table.set_file_table([], [])
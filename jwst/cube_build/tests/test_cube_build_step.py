@@ -108,11 +108,13 @@ def test_call_cube_build(_jail, miri_cube_pars, miri_image):
     # in a unit test
 
     # Test ErrorNoAssignWCS is raised
-    with pytest.raises(ErrorNoAssignWCS):
+    with pytest.raises(ErrorNoAssignWCS) as excinfo:
         step = CubeBuildStep.from_config_file('config/cube_build.cfg')
         step.override_cubepar = miri_cube_pars
         step.channel = '3'
         step.run(miri_image)
+    assert str(excinfo.value) == \
+        'Assign WCS has not been run on file test_miri.fits'
 
     # Test some defaults to step are setup correctly and
     # is user specifies channel is set up correctly
@@ -59,6 +59,9 @@ HORIZONTAL = 1
 VERTICAL = 2
 """Dispersion direction, predominantly horizontal or vertical."""
 
+SOSS_SPECTRAL_ORDERS = (1, 2, 3)
+"""Spectral order numbers to extract for NIRISS SOSS data."""
+
 # This is intended to be larger than any possible distance (in pixels)
 # between the target and any point in the image; used by locn_from_wcs().
 HUGE_DIST = 1.e20
@@ -1897,15 +1900,17 @@ class ExtractModel(ExtractBase):
             sy0 = int(round(self.ystart))
             sy1 = int(round(self.ystop)) + 1
             # Convert non-positive values to NaN, to easily ignore them.
-            wl = wl_array.copy()                # don't modify wl_array
-            nan_flag = np.isnan(wl)
-            # To avoid a warning about invalid value encountered in less_equal.
-            wl[nan_flag] = -1000.
-            wl = np.where(wl <= 0., np.nan, wl)
+            # Only the extraction region is needed, so copy just that
+            # section rather than the full array.
+            wl = wl_array[sy0:sy1, sx0:sx1].copy()  # don't modify wl_array
+            # NaNs compare as False, so they are left unchanged; errstate
+            # avoids a warning about invalid value encountered in less_equal.
+            with np.errstate(invalid='ignore'):
+                wl[wl <= 0.] = np.nan
             if self.dispaxis == HORIZONTAL:
-                wavelength = np.nanmean(wl[sy0:sy1, sx0:sx1], axis=0)
+                wavelength = np.nanmean(wl, axis=0)
             else:
-                wavelength = np.nanmean(wl[sy0:sy1, sx0:sx1], axis=1)
+                wavelength = np.nanmean(wl, axis=1)
 
         # Now call the wcs function to compute the celestial coordinates.
         # Also use the returned wavelengths if we weren't able to get them
@@ -1991,7 +1996,7 @@ class ExtractModel(ExtractBase):
         if n_nan > 0:
             (wavelength, temp_flux, background, npixels, dq) = \
                 nans_at_endpoints(wavelength, temp_flux, background,
-                                  npixels, dq, verbose)
+                                  npixels, dq, verbose, nan_mask=nan_mask)
 
         return (ra, dec, wavelength, temp_flux, background, npixels, dq)
 
@@ -2280,9 +2285,9 @@ class ImageExtractModel(ExtractBase):
         # Extract the data.
         gross = (data * mask_target).sum(axis=axis, dtype=np.float)
 
-        # Compute the number of pixels that were added together to get gross.
-        temp = np.ones_like(data)
-        npixels = (temp * mask_target).sum(axis=axis, dtype=np.float)
+        # The number of pixels that were added together to get gross is
+        # just the number of pixels in the target extraction region.
+        npixels = n_target.copy()
 
         if self.subtract_background is not None:
             if not self.subtract_background:
@@ -2298,15 +2303,16 @@ class ImageExtractModel(ExtractBase):
         if mask_bkg is not None:
             n_bkg = mask_bkg.sum(axis=axis, dtype=np.float)
             # -1 is used as a flag, and also to avoid dividing by zero.
-            n_bkg = np.where(n_bkg == 0., -1., n_bkg)
+            no_bkg = (n_bkg == 0.)
+            n_bkg[no_bkg] = -1.
             background = (data * mask_bkg).sum(axis=axis, dtype=np.float)
             scalefactor = n_target / n_bkg
-            scalefactor = np.where(n_bkg > 0., scalefactor, 0.)
+            scalefactor[no_bkg] = 0.
             background *= scalefactor
             # Boxcar smoothing.
             if self.smoothing_length > 1:
                 background = extract1d.bxcar(background, self.smoothing_length)
-                background = np.where(n_bkg > 0., background, 0.)
+                background[no_bkg] = 0.
             temp_flux = gross - background
         else:
             background = np.zeros_like(gross)
@@ -2368,10 +2374,8 @@ class ImageExtractModel(ExtractBase):
         if got_wavelength:
             indx = np.around(x_array).astype(np.int)
             indy = np.around(y_array).astype(np.int)
-            indx = np.where(indx < 0, 0, indx)
-            indx = np.where(indx >= shape[1], shape[1] - 1, indx)
-            indy = np.where(indy < 0, 0, indy)
-            indy = np.where(indy >= shape[0], shape[0] - 1, indy)
+            np.clip(indx, 0, shape[1] - 1, out=indx)
+            np.clip(indy, 0, shape[0] - 1, out=indy)
             wavelength = wl_array[indy, indx]
 
         if self.wcs is not None:
@@ -2434,7 +2438,7 @@ class ImageExtractModel(ExtractBase):
                 log.warning("%d NaNs in wavelength array", n_nan)
             (wavelength, temp_flux, background, npixels, dq) = \
                 nans_at_endpoints(wavelength, temp_flux, background,
-                                  npixels, dq, verbose)
+                                  npixels, dq, verbose, nan_mask=nan_mask)
 
         return (ra, dec, wavelength, temp_flux, background, npixels, dq)
 
@@ -2503,10 +2507,11 @@ class ImageExtractModel(ExtractBase):
             `mask_bkg` will be set to None.
         """
 
-        mask_target = np.where(ref > 0., 1., 0.)
+        mask_target = (ref > 0.).astype(np.float64)
 
-        if np.any(ref < 0.):
-            mask_bkg = np.where(ref < 0., 1., 0.)
+        is_bkg = (ref < 0.)
+        if np.any(is_bkg):
+            mask_bkg = is_bkg.astype(np.float64)
         else:
             mask_bkg = None
 
@@ -2573,10 +2578,17 @@ def run_extract1d(input_model, refname, smoothing_length, bkg_order,
     # we'll set S_EXTR1D to 'COMPLETE'.
     if ref_dict is not None:
         ref_dict['need_to_set_to_complete'] = False
-    output_model = do_extract1d(input_model, ref_dict,
-                                smoothing_length, bkg_order,
-                                log_increment, subtract_background,
-                                apply_nod_offset, was_source_model)
+    try:
+        output_model = do_extract1d(input_model, ref_dict,
+                                    smoothing_length, bkg_order,
+                                    log_increment, subtract_background,
+                                    apply_nod_offset, was_source_model)
+    except Exception:
+        # do_extract1d closes a reference image opened by load_ref_file
+        # when it finishes, but not if the extraction fails.
+        if ref_dict is not None and 'ref_model' in ref_dict:
+            ref_dict['ref_model'].close()
+        raise
 
     return output_model
 
@@ -2683,9 +2695,6 @@ def do_extract1d(input_model, ref_dict, smoothing_length=None,
         output_model.int_times = input_model.int_times.copy()
     output_model.update(input_model)
 
-    # This data type is used for creating an output table.
-    spec_dtype = datamodels.SpecModel().spec_table.dtype
-
     # This will be relevant if we're asked to extract a spectrum and the
     # spectral order is zero.  That's only OK if the disperser is a prism.
     prism_mode = is_prism(input_model)
@@ -2814,10 +2823,9 @@ def do_extract1d(input_model, ref_dict, smoothing_length=None,
             error = np.zeros_like(flux)
             sb_error = np.zeros_like(flux)
             berror = np.zeros_like(flux)
-            otab = np.array(list(zip(wavelength,
-                                     flux, error, surf_bright, sb_error,
-                                     dq, background, berror, npixels)),
-                            dtype=spec_dtype)
+            otab = ifu.make_spec_table(wavelength, flux, error,
+                                       surf_bright, sb_error,
+                                       dq, background, berror, npixels)
             spec = datamodels.SpecModel(spec_table=otab)
             spec.meta.wcs = spec_wcs.create_spectral_wcs(ra, dec, wavelength)
             spec.spec_table.columns['wavelength'].unit = 'um'
@@ -2847,7 +2855,7 @@ def do_extract1d(input_model, ref_dict, smoothing_length=None,
         if input_model.meta.exposure.type == "NIS_SOSS":
             # This list of spectral order numbers may need to be assigned
             # differently for other exposure types.
-            spectral_order_list = [1, 2, 3]
+            spectral_order_list = SOSS_SPECTRAL_ORDERS
         else:
             # For this case, we'll call get_spectral_order to get the order.
             spectral_order_list = ["not set yet"]
@@ -2953,11 +2961,9 @@ def do_extract1d(input_model, ref_dict, smoothing_length=None,
                 error = np.zeros_like(flux)
                 sb_error = np.zeros_like(flux)
                 berror = np.zeros_like(flux)
-                otab = np.array(list(zip(wavelength,
-                                         flux, error,
-                                         surf_bright, sb_error,
-                                         dq, background, berror, npixels)),
-                                dtype=spec_dtype)
+                otab = ifu.make_spec_table(wavelength, flux, error,
+                                           surf_bright, sb_error,
+                                           dq, background, berror, npixels)
                 spec = datamodels.SpecModel(spec_table=otab)
                 spec.meta.wcs = spec_wcs.create_spectral_wcs(
                                         ra, dec, wavelength)
@@ -3036,16 +3042,33 @@ def do_extract1d(input_model, ref_dict, smoothing_length=None,
                 else:
                     log.info("Beginning loop over {} integrations ...".format(shape[0]))
                     integrations = range(shape[0])
+                # The wavelengths are the same for every integration, so
+                # only evaluate them once for this spectral order.
+                wl_array = get_wavelengths(input_model, exp_type,
+                                           extract_params['spectral_order'])
+                wl_nan_mask = np.isnan(wl_array)
+                # Likewise, the extraction model only needs to be set up
+                # once, rather than for each integration.
+                if integrations[0] > -1:
+                    data_shape = shape[1:]
+                else:
+                    data_shape = shape
+                try:
+                    (extract_model, prev_offset) = setup_extract_model(
+                                        input_model, slit, data_shape,
+                                        prev_offset, verbose, extract_params)
+                except InvalidSpectralOrderNumberError as e:
+                    log.info(str(e) + ", skipping ...")
+                    continue
                 for integ in integrations:
                     # Extract spectrum
-                    try:
-                        (ra, dec, wavelength, temp_flux, background,
-                         npixels, dq, prev_offset) = extract_one_slit(
-                                        input_model, slit, integ,
-                                        prev_offset, verbose, extract_params)
-                    except InvalidSpectralOrderNumberError as e:
-                        log.info(str(e) + ", skipping ...")
-                        break
+                    (ra, dec, wavelength, temp_flux, background,
+                     npixels, dq, prev_offset) = extract_one_slit(
+                                    input_model, slit, integ,
+                                    prev_offset, verbose, extract_params,
+                                    wl_array=wl_array,
+                                    wl_nan_mask=wl_nan_mask,
+                                    extract_model=extract_model)
 
                     # Convert the sum to an average, for surface brightness.
                     npixels_temp = np.where(npixels > 0., npixels, 1.)
@@ -3070,12 +3093,9 @@ def do_extract1d(input_model, ref_dict, smoothing_length=None,
                     error = np.zeros_like(flux)
                     sb_error = np.zeros_like(flux)
                     berror = np.zeros_like(flux)
-                    otab = np.array(list(zip(wavelength,
-                                             flux, error,
-                                             surf_bright, sb_error,
-                                             dq, background, berror,
-                                             npixels)),
-                                    dtype=spec_dtype)
+                    otab = ifu.make_spec_table(wavelength, flux, error,
+                                               surf_bright, sb_error,
+                                               dq, background, berror, npixels)
                     spec = datamodels.SpecModel(spec_table=otab)
                     spec.meta.wcs = spec_wcs.create_spectral_wcs(
                                         ra, dec, wavelength)
@@ -3419,7 +3439,8 @@ def copy_keyword_info(slit, slitname, spec):
 
 
 def extract_one_slit(input_model, slit, integ,
-                     prev_offset, verbose, extract_params):
+                     prev_offset, verbose, extract_params, wl_array=None,
+                     wl_nan_mask=None, extract_model=None):
     """Extract data for one slit, or spectral order, or plane.
 
     Parameters
@@ -3451,6 +3472,25 @@ def extract_one_slit(input_model, slit, integ,
     extract_params : dict
         Parameters read from the reference file.
 
+    wl_array : ndarray, 2-D, or None
+        The wavelength at each pixel of the data array.  If None (the
+        default), the wavelengths will be read or computed here.  When
+        extracting from multi-integration data, the wavelengths only need
+        to be determined once, so the caller may pass them in.
+
+    wl_nan_mask : ndarray of bool, or None
+        True where `wl_array` is NaN.  This may be given along with
+        `wl_array`; see `replace_bad_values`.
+
+    extract_model : ExtractModel or ImageExtractModel, or None
+        An extraction model that has already been set up by
+        `setup_extract_model`, for the same shape of data.  If None (the
+        default), the model will be created here.  When extracting from
+        multi-integration data, the model is the same for every
+        integration, so the caller may create it once and pass it in.
+        In that case the nod/dither offset will be taken from the model,
+        and `prev_offset` will be ignored.
+
     Returns
     -------
     ra, dec : float
@@ -3487,31 +3527,87 @@ def extract_one_slit(input_model, slit, integ,
         copied from the input `prev_offset`.
     """
 
-    if verbose:
-        log_initial_parameters(extract_params)
-
     exp_type = input_model.meta.exposure.type
     input_dq = None                             # possibly replaced below
     if integ > -1:
         data = input_model.data[integ]
         if hasattr(input_model, 'dq'):
             input_dq = input_model.dq[integ]
-        wl_array = get_wavelengths(input_model, exp_type,
-                                   extract_params['spectral_order'])
+        if wl_array is None:
+            wl_array = get_wavelengths(input_model, exp_type,
+                                       extract_params['spectral_order'])
     elif slit is None:
         data = input_model.data
         if hasattr(input_model, 'dq'):
             input_dq = input_model.dq
-        wl_array = get_wavelengths(input_model, exp_type,
-                                   extract_params['spectral_order'])
+        if wl_array is None:
+            wl_array = get_wavelengths(input_model, exp_type,
+                                       extract_params['spectral_order'])
     else:
         data = slit.data
         if hasattr(slit, 'dq'):
             input_dq = slit.dq
-        wl_array = get_wavelengths(slit, exp_type,
-                                   extract_params['spectral_order'])
+        if wl_array is None:
+            wl_array = get_wavelengths(slit, exp_type,
+                                       extract_params['spectral_order'])
+
+    data = replace_bad_values(data, input_dq, wl_array, wl_nan_mask)
+
+    if extract_model is None:
+        (extract_model, offset) = setup_extract_model(
+                                        input_model, slit, data.shape,
+                                        prev_offset, verbose, extract_params)
+    else:
+        offset = extract_model.nod_correction
+
+    (ra, dec, wavelength, temp_flux, background, npixels, dq) = \
+                extract_model.extract(data, wl_array, verbose)
+
+    return (ra, dec, wavelength, temp_flux, background, npixels, dq, offset)
+
+
+def setup_extract_model(input_model, slit, shape,
+                        prev_offset, verbose, extract_params):
+    """Create the extraction model for one slit, or spectral order.
+
+    Parameters
+    ----------
+    input_model : data model
+        The input science model.
 
-    data = replace_bad_values(data, input_dq, wl_array)
+    slit : one slit from a MultiSlitModel (or similar), or None
+        The slit for which the model will be used, or None if the data
+        array is input_model.data.
+
+    shape : tuple
+        The shape of the data array from which the spectrum will be
+        extracted.
+
+    prev_offset : float or str
+        Either the previously computed nod/dither offset or a value (a
+        string) indicating that the offset hasn't been computed yet.  In
+        the latter case, method `offset_from_offset` will be called to
+        determine the offset.
+
+    verbose : boolean
+        If True, log more info (extraction parameters, for example).
+
+    extract_params : dict
+        Parameters read from the reference file.
+
+    Returns
+    -------
+    extract_model : ExtractModel or ImageExtractModel
+        The extraction model, with the extraction limits, the nod/dither
+        correction and the polynomial limits all assigned, ready for
+        calling its `extract` method.
+
+    offset : float
+        The nod/dither offset in the cross-dispersion direction.
+    """
+
+    if verbose:
+        log_initial_parameters(extract_params)
 
     if extract_params['ref_file_type'] == FILE_TYPE_IMAGE:
         # The reference file is an image.
@@ -3521,7 +3617,7 @@ def extract_one_slit(input_model, slit, integ,
         # If there is a reference file (there doesn't have to be), it's in
         # JSON format.
         extract_model = ExtractModel(input_model, slit, verbose, **extract_params)
-        ap = get_aperture(data.shape, extract_model.wcs,
+        ap = get_aperture(shape, extract_model.wcs,
                           verbose, extract_params)
         extract_model.update_extraction_limits(ap)
 
@@ -3543,19 +3639,17 @@ def extract_one_slit(input_model, slit, integ,
 
     # Add the nod/dither offset to the polynomial coefficients, or shift
     # the reference image (depending on the type of reference file).
-    extract_model.add_nod_correction(verbose, data.shape)
+    extract_model.add_nod_correction(verbose, shape)
 
     if verbose:
         extract_model.log_extraction_parameters()
 
     extract_model.assign_polynomial_limits(verbose)
-    (ra, dec, wavelength, temp_flux, background, npixels, dq) = \
-                extract_model.extract(data, wl_array, verbose)
 
-    return (ra, dec, wavelength, temp_flux, background, npixels, dq, offset)
+    return (extract_model, offset)
 
 
-def replace_bad_values(data, input_dq, wl_array):
+def replace_bad_values(data, input_dq, wl_array, wl_nan_mask=None):
     """Replace values flagged with DO_NOT_USE or that have NaN wavelengths.
 
     Parameters
@@ -3573,6 +3667,12 @@ def replace_bad_values(data, input_dq, wl_array):
         array that is NaN, the corresponding element in `data` will be
         set to NaN.
 
+    wl_nan_mask : ndarray of bool, or None
+        True where `wl_array` is NaN.  This is the same for every
+        integration of multi-integration data, so the caller may compute
+        it once and pass it in.  It will not be modified.  If None (the
+        default), it will be computed here.
+
     Returns
     -------
     ndarray
@@ -3581,21 +3681,25 @@ def replace_bad_values(data, input_dq, wl_array):
         should not be included when doing the 1-D spectral extraction.
     """
 
-    mask = np.isnan(wl_array)
+    if wl_nan_mask is None:
+        wl_nan_mask = np.isnan(wl_array)
+    mask = wl_nan_mask
     if input_dq is not None:
-        bad_mask = np.bitwise_and(input_dq, dqflags.pixel['DO_NOT_USE']) > 0
-        mask = np.logical_or(mask, bad_mask)
+        # This is a new array, so the wavelength mask can be combined with
+        # it in-place without modifying `wl_nan_mask`.
+        mask = np.bitwise_and(input_dq, dqflags.pixel['DO_NOT_USE']) > 0
+        np.logical_or(mask, wl_nan_mask, out=mask)
 
     if np.any(mask):
         mod_data = data.copy()
-        mod_data[mask] = np.nan
+        np.putmask(mod_data, mask, np.nan)
         return mod_data
     else:
         return data
 
 
 def nans_at_endpoints(wavelength, temp_flux, background,
-                      npixels, dq, verbose):
+                      npixels, dq, verbose, nan_mask=None):
     """Flag NaNs in the wavelength array.
 
     Extended summary
@@ -3626,6 +3730,11 @@ def nans_at_endpoints(wavelength, temp_flux, background,
     verbose : bool
         If True and the arrays were trimmed, log a message.
 
+    nan_mask : ndarray of bool, or None
+        True where `wavelength` is NaN.  If the caller has already
+        computed this it can be passed in; if None (the default), it will
+        be computed here.
+
     Returns
     -------
     wavelength, temp_flux, background, npixels, dq : ndarray
@@ -3641,7 +3750,8 @@ def nans_at_endpoints(wavelength, temp_flux, background,
     new_dq = dq.copy()
     nelem = wavelength.shape[0]
 
-    nan_mask = np.isnan(wavelength)
+    if nan_mask is None:
+        nan_mask = np.isnan(wavelength)
 
     new_dq[nan_mask] = np.bitwise_or(new_dq[nan_mask],
                                      dqflags.pixel['DO_NOT_USE'])
@@ -278,7 +278,8 @@ def bxcar(image, smoothing_length):
         i += 1
     temp_im /= float(smoothing_length)
 
-    return temp_im[..., half:half + width].astype(image.dtype)
+    # No copy is needed if the input is already float64.
+    return temp_im[..., half:half + width].astype(image.dtype, copy=False)
 
 
 def _extract_src_flux(image, x, j, lam, srclim,
@@ -359,32 +360,37 @@ def _extract_src_flux(image, x, j, lam, srclim,
     area = area[good]
     y = y[good]
     if bkgmodel is None:
-        bkg = np.zeros_like(val, dtype=np.float64)
+        # nothing to subtract
+        bkg = None
     else:
         bkg = bkgmodel(y)
 
-    # subtract background:
-    val -= bkg
+        # subtract background:
+        val -= bkg
 
     # brightness -> flux:
     val *= area
-    bkg *= area
-
-    # compute weights:
-    if weights is None:
-        wht = np.ones_like(y, dtype=np.float64)
-    else:
-        wht = weights(lam, y)
+    if bkg is not None:
+        bkg *= area
 
     # compute weighted total flux
     # NOTE: the correct formulae must be derived depending on
     #       final interpretation of weights [not available at
     #       initial release v0.0.1]
     tarea = area.sum(dtype=np.float64)
-    twht = wht.sum(dtype=np.float64)
-    mwht = twht / wht.shape[0]
-    total_flux = (val * wht).sum(dtype=np.float64) / mwht
-    bkg_flux = bkg.sum(dtype=np.float64)
+    if weights is None:
+        # unit weights, so the mean weight is 1
+        twht = float(y.shape[0])
+        total_flux = val.sum(dtype=np.float64)
+    else:
+        wht = weights(lam, y)
+        twht = wht.sum(dtype=np.float64)
+        mwht = twht / wht.shape[0]
+        total_flux = (val * wht).sum(dtype=np.float64) / mwht
+    if bkg is None:
+        bkg_flux = 0.0
+    else:
+        bkg_flux = bkg.sum(dtype=np.float64)
 
     return (total_flux, bkg_flux, tarea, twht)
 
@@ -1,4 +1,5 @@
 from distutils.version import LooseVersion
+import functools
 import logging
 import math
 
@@ -27,6 +28,48 @@ OFFSET_NOT_ASSIGNED_YET = "not assigned yet"
 # between the target and any point in the image; used by locn_from_wcs().
 HUGE_DIST = 1.e10
 
+
+@functools.lru_cache(maxsize=None)
+def spec_table_dtype():
+    """Return the data type of the spec_table in a SpecModel.
+
+    The output tables for extract_1d all have this data type, so it is
+    only looked up (by creating a SpecModel) once.
+    """
+    return datamodels.SpecModel().spec_table.dtype
+
+
+def make_spec_table(wavelength, flux, error, surf_bright, sb_error,
+                    dq, background, berror, npixels):
+    """Create the table of extracted values for a SpecModel.
+
+    Parameters
+    ----------
+    wavelength, flux, error, surf_bright, sb_error, dq, background, \
+    berror, npixels : ndarray, 1-D
+        The values for each column of the table.  All of these arrays
+        should have the same length.
+
+    Returns
+    -------
+    otab : ndarray, 1-D
+        A structured array with data type `spec_table_dtype()`.
+    """
+
+    otab = np.zeros(len(wavelength), dtype=spec_table_dtype())
+    otab['WAVELENGTH'] = wavelength
+    otab['FLUX'] = flux
+    otab['ERROR'] = error
+    otab['SURF_BRIGHT'] = surf_bright
+    otab['SB_ERROR'] = sb_error
+    otab['DQ'] = dq
+    otab['BACKGROUND'] = background
+    otab['BERROR'] = berror
+    otab['NPIXELS'] = npixels
+
+    return otab
+
+
 def ifu_extract1d(input_model, ref_dict, source_type, subtract_background):
     """Extract a 1-D spectrum from an IFU cube.
 
@@ -128,11 +171,8 @@ def ifu_extract1d(input_model, ref_dict, source_type, subtract_background):
     error = np.zeros_like(flux)
     sb_error = np.zeros_like(flux)
     berror = np.zeros_like(flux)
-    spec_dtype = datamodels.SpecModel().spec_table.dtype
-    otab = np.array(list(zip(wavelength,
-                             flux, error, surf_bright, sb_error,
-                             dq, background, berror, npixels)),
-                    dtype=spec_dtype)
+    otab = make_spec_table(wavelength, flux, error, surf_bright, sb_error,
+                           dq, background, berror, npixels)
     spec = datamodels.SpecModel(spec_table=otab)
     spec.meta.wcs = spec_wcs.create_spectral_wcs(ra, dec, wavelength)
     spec.spec_table.columns['wavelength'].unit = 'um'
@@ -843,10 +883,11 @@ def separate_target_and_background(ref):
         be set to None.
     """
 
-    mask_target = np.where(ref == 1., 1., 0.)
+    mask_target = (ref == 1.).astype(np.float64)
 
-    if np.any(ref == -1.):
-        mask_bkg = np.where(ref == -1., 1., 0.)
+    is_bkg = (ref == -1.)
+    if np.any(is_bkg):
+        mask_bkg = is_bkg.astype(np.float64)
     else:
         mask_bkg = None
 
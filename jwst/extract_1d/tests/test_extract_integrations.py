@@ -0,0 +1,114 @@
+"""
+Test extraction from multi-integration data with do_extract1d
+"""
+import numpy as np
+import pytest
+
+from jwst import datamodels
+from jwst.datamodels import dqflags
+from jwst.extract_1d import extract
+
+
+shape = (4, 16, 30)
+
+
+class DummyWCS:
+    """Placeholder WCS, with wavelength increasing along the x-axis"""
+
+    def __init__(self, shape):
+        self.bounding_box = ((-0.5, shape[-1] - 0.5),
+                             (-0.5, shape[-2] - 0.5))
+
+    def __call__(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        ra = x * 0. + 10. + 0.001 * y
+        dec = y * 0. + 20. + 0.001 * x
+        wavelength = 1. + 0.01 * x
+        return ra, dec, wavelength
+
+
+def make_cube(shape):
+    """Create a multi-integration CubeModel with a few flagged pixels"""
+
+    rng = np.random.RandomState(1)
+    input_model = datamodels.CubeModel(shape)
+    input_model.data = rng.normal(10., 1., shape).astype(np.float32)
+    input_model.dq = np.zeros(shape, dtype=np.uint32)
+    do_not_use = dqflags.pixel['DO_NOT_USE']
+    # flagged in every integration, in the source region
+    input_model.dq[:, 7, 10] = do_not_use
+    # flagged in only some integrations, in source and background regions
+    input_model.dq[1, 6, 15] = do_not_use
+    input_model.dq[2, 1, 20] = do_not_use
+    input_model.dq[3, 8, 4] = dqflags.pixel['SATURATED']
+    input_model.meta.exposure.type = 'NRS_BRIGHTOBJ'
+    input_model.meta.exposure.nints = shape[0]
+    input_model.meta.wcsinfo.dispersion_direction = 1
+    input_model.meta.target.source_type = 'POINT'
+    input_model.meta.wcs = DummyWCS(shape)
+    return input_model
+
+
+def json_ref_dict():
+    return {"ref_file_type": extract.FILE_TYPE_JSON,
+            "apertures": [{"id": "ANY",
+                           "src_coeff": [[4.5, 0.01], [9.5, 0.01]],
+                           "bkg_coeff": [[0.5], [2.5], [12.5], [14.5]],
+                           "xstart": 2,
+                           "xstop": 27,
+                           "bkg_order": 1,
+                           "smoothing_length": 3,
+                           "apply_nod_offset": False
+                          }
+                         ]
+           }
+
+
+def image_ref_dict():
+    ref_image = np.zeros(shape[-2:], dtype=np.float32)
+    ref_image[5:10, 3:25] = 1.
+    ref_image[0:2, 3:20] = -1.
+    ref_image[13:15, 3:20] = -1.
+    ref_model = datamodels.MultiExtract1dImageModel()
+    image = datamodels.Extract1dImageModel(data=ref_image)
+    image.name = "ANY"
+    image.spectral_order = 1000
+    image.smoothing_length = 0
+    ref_model.images.append(image)
+    return {"ref_file_type": extract.FILE_TYPE_IMAGE,
+            "ref_model": ref_model}
+
+
+@pytest.mark.parametrize("make_ref_dict", [json_ref_dict, image_ref_dict])
+def test_extract_integrations(make_ref_dict):
+    """Test that each integration is extracted as if on its own"""
+
+    input_model = make_cube(shape)
+
+    output = extract.do_extract1d(input_model, make_ref_dict(),
+                                  log_increment=0)
+    assert len(output.spec) == shape[0]
+
+    sp_order = extract.get_spectral_order(input_model)
+    for integ in range(shape[0]):
+        # set up the extraction from scratch for each integration
+        extract_params = extract.get_extract_parameters(
+                            make_ref_dict(), input_model, "ANY", sp_order,
+                            input_model.meta, None, None, None)
+        extract_params['dispaxis'] = \
+                            input_model.meta.wcsinfo.dispersion_direction
+        (ra, dec, wavelength, temp_flux, background, npixels, dq,
+         offset) = extract.extract_one_slit(
+                            input_model, None, integ,
+                            extract.OFFSET_NOT_ASSIGNED_YET, False,
+                            extract_params)
+
+        npixels_temp = np.where(npixels > 0., npixels, 1.)
+        spec_table = output.spec[integ].spec_table
+        np.testing.assert_array_equal(spec_table['wavelength'], wavelength)
+        np.testing.assert_array_equal(spec_table['flux'], temp_flux)
+        np.testing.assert_array_equal(spec_table['background'],
+                                      background / npixels_temp)
+        np.testing.assert_array_equal(spec_table['npixels'], npixels)
+        np.testing.assert_array_equal(spec_table['dq'], dq)
@@ -50,12 +50,12 @@ def extract2d(input_model,
     slitless_modes = ['NIS_WFSS', 'NRC_WFSS', 'NRC_TSGRISM']
 
     exp_type = input_model.meta.exposure.type.upper()
-    log.info('EXP_TYPE is {0}'.format(exp_type))
+    log.info('EXP_TYPE is %s', exp_type)
 
     if exp_type in nrs_modes:
         if input_model.meta.instrument.grating.lower() == "mirror":
             # Catch the case of EXP_TYPE=NRS_LAMP and grating=MIRROR
-            log.info("'EXP_TYPE {} with grating=MIRROR not supported for extract 2D".format(exp_type))
+            log.info("'EXP_TYPE %s with grating=MIRROR not supported for extract 2D", exp_type)
             input_model.meta.cal_step.extract_2d = 'SKIPPED'
             return input_model
         output_model = nrs_extract2d(input_model,
@@ -78,11 +78,10 @@ def extract2d(input_model,
                                                  mmag_extract=99.)
 
     else:
-        log.info("'EXP_TYPE {} not supported for extract 2D".format(exp_type))
+        log.info("'EXP_TYPE %s not supported for extract 2D", exp_type)
         input_model.meta.cal_step.extract_2d = 'SKIPPED'
         return input_model
 
     # Set the step status to COMPLETE
     output_model.meta.cal_step.extract_2d = 'COMPLETE'
-    del input_model
     return output_model
@@ -1,8 +1,11 @@
+import functools
+
 import numpy as np
 from astropy.convolution import Gaussian2DKernel
 from astropy.stats import sigma_clipped_stats, gaussian_fwhm_to_sigma
 import astropy.units as u
 import photutils
+from scipy import ndimage
 
 from ..datamodels import DrizProductModel
 
@@ -98,12 +101,16 @@ def make_source_catalog(model, kernel_fwhm, kernel_xsize, kernel_ysize,
         model.data, mask=mask, sigma=3.0, maxiters=10)
     threshold = data_median + (data_std * snr_threshold)
 
-    sigma = kernel_fwhm * gaussian_fwhm_to_sigma
-    kernel = Gaussian2DKernel(sigma, x_size=kernel_xsize, y_size=kernel_ysize)
-    kernel.normalize()
+    kernel = _make_kernel(kernel_fwhm, kernel_xsize, kernel_ysize)
 
-    segm = photutils.detect_sources(model.data, threshold, npixels=npixels,
-                                    filter_kernel=kernel,
+    # Filter the image only once, for both detection and deblending,
+    # instead of having photutils filter it separately for each.  This
+    # matches the filtering that photutils does with filter_kernel.
+    filtered_data = ndimage.convolve(model.data.astype(float), kernel,
+                                     mode='constant', cval=0.0)
+
+    segm = photutils.detect_sources(filtered_data, threshold,
+                                    npixels=npixels,
                                     connectivity=connectivity)
 
     # segm=None for photutils >= 0.7; segm.nlabels == 0 for photutils < 0.7
@@ -112,8 +119,8 @@ def make_source_catalog(model, kernel_fwhm, kernel_xsize, kernel_ysize,
 
     # source deblending requires scikit-image
     if deblend:
-        segm = photutils.deblend_sources(model.data, segm, npixels=npixels,
-                                         filter_kernel=kernel,
+        segm = photutils.deblend_sources(filtered_data, segm,
+                                         npixels=npixels,
                                          nlevels=deblend_nlevels,
                                          contrast=deblend_contrast,
                                          mode=deblend_mode,
@@ -127,7 +134,11 @@ def make_source_catalog(model, kernel_fwhm, kernel_xsize, kernel_ysize,
     exptime = model.meta.resample.product_exposure_time    # total exptime
     # total_error = np.sqrt(bkg_error**2 +
     #                       np.maximum(model.data / exptime, 0))
-    total_error = np.sqrt(data_std**2 + np.maximum(model.data / exptime, 0))
+    # the error array is built in place to avoid full-size temporaries
+    total_error = model.data / exptime
+    np.maximum(total_error, 0, out=total_error)
+    total_error += data_std**2
+    np.sqrt(total_error, out=total_error)
 
     wcs = model.get_fits_wcs()
     source_props = photutils.source_properties(
@@ -154,26 +165,67 @@ def make_source_catalog(model, kernel_fwhm, kernel_xsize, kernel_ysize,
     if pixelarea is None:
         micro_Jy = np.full(nsources, np.nan)
     else:
-        micro_Jy = (catalog['source_sum'] *
-                    model.meta.photometry.conversion_microjanskys *
-                    model.meta.photometry.pixelarea_arcsecsq)
+        micro_Jy = np.multiply(catalog['source_sum'],
+                               model.meta.photometry.conversion_microjanskys)
+        micro_Jy *= pixelarea
 
     # define AB mag
+    # the magnitudes are computed in place, and only for finite fluxes
     abmag = np.full(nsources, np.nan)
     mask = np.isfinite(micro_Jy)
-    abmag[mask] = -2.5 * np.log10(micro_Jy[mask]) + 23.9
+    np.log10(micro_Jy, out=abmag, where=mask)
+    abmag *= -2.5
+    abmag += 23.9
     catalog['abmag'] = abmag
 
     # define AB mag error
     # assuming SNR >> 1 (otherwise abmag_error is asymmetric)
-    abmag_error = (2.5 * np.log10(np.e) * catalog['source_sum_err'] /
-                   catalog['source_sum'])
-    abmag_error[~mask] = np.nan
+    # computed in the same way as abmag, over the same finite-flux mask
+    abmag_error = np.full(nsources, np.nan)
+    np.multiply(catalog['source_sum_err'], 2.5 * np.log10(np.e),
+                out=abmag_error, where=mask)
+    np.divide(abmag_error, catalog['source_sum'], out=abmag_error,
+              where=mask)
     catalog['abmag_error'] = abmag_error
 
     return catalog
 
 
+@functools.lru_cache(maxsize=16)
+def _make_kernel(kernel_fwhm, kernel_xsize, kernel_ysize):
+    """
+    Make the normalized 2D Gaussian kernel used to filter the image.
+
+    The kernel depends only on the input parameters, so it is cached and
+    reused for catalogs made with the same kernel parameters.  The
+    cached array is shared, so it is made read-only.
+
+    Parameters
+    ----------
+    kernel_fwhm : float
+        The full-width at half-maximum (FWHM) of the 2D Gaussian kernel.
+
+    kernel_xsize : odd int
+        The size in the x dimension (columns) of the kernel array.
+
+    kernel_ysize : odd int
+        The size in the y dimension (row) of the kernel array.
+
+    Returns
+    -------
+    kernel : 2D `~numpy.ndarray`
+        The normalized, read-only kernel array.
+    """
+
+    sigma = kernel_fwhm * gaussian_fwhm_to_sigma
+    kernel = Gaussian2DKernel(sigma, x_size=kernel_xsize, y_size=kernel_ysize)
+    kernel.normalize()
+    kernel = kernel.array
+    kernel.flags.writeable = False
+
+    return kernel
+
+
 def _get_rotation(wcs, skew_tolerance=0.01):
     """
     Get the rotation of an image from its WCS.
@@ -1,9 +1,11 @@
 import math
 
 import numpy as np
+from photutils import CircularAperture, CircularAnnulus
 
 from jwst import datamodels
-from jwst.tso_photometry.tso_photometry import tso_aperture_photometry
+from jwst.tso_photometry.tso_photometry import (tso_aperture_photometry,
+                                                _aperture_sums)
 
 shape = (7, 100, 150)
 xcenter = 75.
@@ -233,3 +235,42 @@ def test_tso_phot_4():
                           58704.65968, 58704.6686, 58704.677512,
                           58704.686428])
     assert np.allclose(catalog['MJD'], int_times, rtol=1.e-8)
+
+
+def test_aperture_sums():
+    """Compare _aperture_sums with do_photometry for each integration"""
+
+    nimg = 3
+    rng = np.random.RandomState(7)
+    data = rng.normal(10., 1., (nimg, 40, 50)).astype(np.float32)
+    err = rng.uniform(0.1, 1., (nimg, 40, 50)).astype(np.float32)
+
+    # a NaN inside the aperture bounding box, but outside the aperture
+    aperture = CircularAperture((20.3, 18.6), r=6.)
+    data[1, 13, 15] = np.nan
+    err[2, 13, 15] = np.nan
+    mask = aperture.to_mask(method='exact')
+    assert mask.to_image(data.shape[1:])[13, 15] == 0.
+
+    apertures = [aperture,
+                 # partial overlap with the edge of the image
+                 CircularAperture((2.4, 37.2), r=6.),
+                 CircularAnnulus((45.7, 20.1), r_in=4., r_out=9.)]
+
+    for aperture in apertures:
+        aperture_sum, aperture_sum_err = _aperture_sums(aperture, data, err)
+        for i in range(nimg):
+            aper_sum, aper_sum_err = aperture.do_photometry(data[i],
+                                                            error=err[i])
+            assert np.isfinite(aperture_sum[i])
+            assert np.isfinite(aperture_sum_err[i])
+            assert np.allclose(aperture_sum[i], aper_sum[0], rtol=1.e-12)
+            # photutils squares the float32 errors in single precision
+            assert np.allclose(aperture_sum_err[i], aper_sum_err[0],
+                               rtol=1.e-6)
+
+    # no overlap with the image
+    aperture = CircularAperture((-20., -20.), r=5.)
+    aperture_sum, aperture_sum_err = _aperture_sums(aperture, data, err)
+    assert np.isnan(aperture_sum).all()
+    assert np.isnan(aperture_sum_err).all()
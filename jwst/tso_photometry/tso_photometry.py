@@ -54,47 +54,33 @@ def tso_aperture_photometry(datamodel, xcenter, ycenter, radius, radius_inner,
             datamodel.meta.subarray.name == 'SUB64P'):
         sub64p_wlp8 = True
 
-    if not sub64p_wlp8:
-        phot_aper = CircularAperture((xcenter, ycenter), r=radius)
-        bkg_aper = CircularAnnulus((xcenter, ycenter), r_in=radius_inner,
-                                   r_out=radius_outer)
-
-    aperture_sum = []
-    aperture_sum_err = []
-    annulus_sum = []
-    annulus_sum_err = []
-
     nimg = datamodel.data.shape[0]
 
     if sub64p_wlp8:
         info = ('Photometry measured as the sum of all values in the '
                 'subarray.  No background subtraction was performed.')
 
-        for i in np.arange(nimg):
-            aperture_sum.append(np.sum(datamodel.data[i, :, :]))
-            aperture_sum_err.append(
-                np.sqrt(np.sum(datamodel.err[i, :, :]**2)))
+        # einsum sums the squared errors without making a squared copy
+        # of the whole error cube
+        aperture_sum = np.sum(datamodel.data, axis=(1, 2))
+        aperture_sum_err = np.sqrt(np.einsum('ijk,ijk->i', datamodel.err,
+                                             datamodel.err))
     else:
         info = ('Photometry measured in a circular aperture of r={0} '
                 'pixels.  Background calculated as the mean in a '
                 'circular annulus with r_inner={1} pixels and '
                 'r_outer={2} pixels.'.format(radius, radius_inner,
                                                 radius_outer))
-        for i in np.arange(nimg):
-            aper_sum, aper_sum_err = phot_aper.do_photometry(
-                datamodel.data[i, :, :], error=datamodel.err[i, :, :])
-            ann_sum, ann_sum_err = bkg_aper.do_photometry(
-                datamodel.data[i, :, :], error=datamodel.err[i, :, :])
-
-            aperture_sum.append(aper_sum[0])
-            aperture_sum_err.append(aper_sum_err[0])
-            annulus_sum.append(ann_sum[0])
-            annulus_sum_err.append(ann_sum_err[0])
-
-    aperture_sum = np.array(aperture_sum)
-    aperture_sum_err = np.array(aperture_sum_err)
-    annulus_sum = np.array(annulus_sum)
-    annulus_sum_err = np.array(annulus_sum_err)
+        phot_aper = CircularAperture((xcenter, ycenter), r=radius)
+        bkg_aper = CircularAnnulus((xcenter, ycenter), r_in=radius_inner,
+                                   r_out=radius_outer)
+
+        # The apertures are the same for all integrations, so the
+        # photometry is done for all integrations at once.
+        aperture_sum, aperture_sum_err = _aperture_sums(
+            phot_aper, datamodel.data, datamodel.err)
+        annulus_sum, annulus_sum_err = _aperture_sums(
+            bkg_aper, datamodel.data, datamodel.err)
 
     # construct metadata for output table
     meta = OrderedDict()
@@ -171,17 +157,17 @@ def tso_aperture_photometry(datamodel, xcenter, ycenter, radius, radius_inner,
         tbl['annulus_sum_err'] = annulus_sum_err
 
         if LooseVersion(photutils.__version__) >= '0.7':
-            annulus_mean = annulus_sum / bkg_aper.area
-            annulus_mean_err = annulus_sum_err / bkg_aper.area
-
-            aperture_bkg = annulus_mean * phot_aper.area
-            aperture_bkg_err = annulus_mean_err * phot_aper.area
+            bkg_area = bkg_aper.area
+            phot_area = phot_aper.area
         else:
-            annulus_mean = annulus_sum / bkg_aper.area()
-            annulus_mean_err = annulus_sum_err / bkg_aper.area()
+            bkg_area = bkg_aper.area()
+            phot_area = phot_aper.area()
+
+        annulus_mean = annulus_sum / bkg_area
+        annulus_mean_err = annulus_sum_err / bkg_area
 
-            aperture_bkg = annulus_mean * phot_aper.area()
-            aperture_bkg_err = annulus_mean_err * phot_aper.area()
+        aperture_bkg = annulus_mean * phot_area
+        aperture_bkg_err = annulus_mean_err * phot_area
 
         tbl['annulus_mean'] = annulus_mean
         tbl['annulus_mean_err'] = annulus_mean_err
@@ -190,8 +176,7 @@ def tso_aperture_photometry(datamodel, xcenter, ycenter, radius, radius_inner,
         tbl['aperture_bkg_err'] = aperture_bkg_err
 
         net_aperture_sum = aperture_sum - aperture_bkg
-        net_aperture_sum_err = np.sqrt(aperture_sum_err ** 2 +
-                                       aperture_bkg_err ** 2)
+        net_aperture_sum_err = np.hypot(aperture_sum_err, aperture_bkg_err)
         tbl['net_aperture_sum'] = net_aperture_sum
         tbl['net_aperture_sum_err'] = net_aperture_sum_err
     else:
@@ -204,3 +189,58 @@ def tso_aperture_photometry(datamodel, xcenter, ycenter, radius, radius_inner,
         tbl['net_aperture_sum_err'] = aperture_sum_err
 
     return tbl
+
+
+def _aperture_sums(aperture, data, err):
+    """
+    Sum the data and errors within an aperture for all integrations.
+
+    Parameters
+    ----------
+    aperture : `~photutils.PixelAperture`
+        The aperture, the same for all integrations.
+
+    data, err : 3-D ndarray
+        The science data and errors.
+
+    Returns
+    -------
+    aperture_sum, aperture_sum_err : 1-D ndarray
+        The sum and its error for each integration, the same (to within
+        rounding) as ``aperture.do_photometry`` would give for each
+        image.  Pixels outside the aperture are not included, even if
+        they are NaN.  These are NaN if the aperture does not overlap
+        the data.
+    """
+
+    nimg = data.shape[0]
+
+    # the aperture weights are computed only once, for the part of the
+    # aperture bounding box that overlaps the data
+    aper_mask = aperture.to_mask(method='exact')
+    slc_data, slc_mask = aper_mask.get_overlap_slices(data.shape[-2:])
+    if slc_data is None:
+        return np.full(nimg, np.nan), np.full(nimg, np.nan)
+    weights = aper_mask.data[slc_mask]
+
+    # views of the cutouts for all integrations; einsum reduces these
+    # without making copies of the data
+    slc_data = (slice(None),) + slc_data
+    data = data[slc_data]
+    err = err[slc_data]
+    aperture_sum = np.einsum('ij,nij->n', weights, data)
+    aperture_var = np.einsum('ij,nij,nij->n', weights, err, err)
+
+    # A NaN at a pixel with zero weight (inside the bounding box but
+    # outside the aperture) makes the whole sum NaN, but it should not
+    # be included.  Redo any non-finite sums one integration at a time,
+    # using only the pixels within the aperture.
+    in_aper = weights > 0
+    weights = weights[in_aper]
+    for i in np.flatnonzero(~np.isfinite(aperture_sum)):
+        aperture_sum[i] = np.sum(weights * data[i][in_aper])
+    for i in np.flatnonzero(~np.isfinite(aperture_var)):
+        err_i = err[i][in_aper]
+        aperture_var[i] = np.sum(weights * err_i * err_i)
+
+    return aperture_sum, np.sqrt(aperture_var)